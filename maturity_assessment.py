@@ -9,7 +9,8 @@ Automated script to:
 4. Create personalized PowerPoint presentations
 
 Usage:
-    python maturity_assessment.py
+    python maturity_assessment.py           # live, concurrent API calls
+    python maturity_assessment.py --batch   # OpenAI Batch API (50% cheaper, up to 24h)
 
 Environment Variables:
     OPENAI_API_KEY: Your OpenAI API key (required)
@@ -17,19 +18,28 @@ Environment Variables:
 
 import pandas as pd
 import numpy as np
+import orjson
 import requests
+import argparse
+import asyncio
+import functools
+import hashlib
 import io
-import urllib3
+import json
+import logging
+import logging.handlers
+import math
+import multiprocessing
 import os
 import re
+import shutil
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pptx import Presentation
 from pptx.util import Pt
 
-# Suppress SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 # Configuration
 SHEET_ID = '1tHWUJWJl_zTwGRTg21qbW_5qpYH8bBMFYZYbIZ03eO8'
 GID = '491555971'
@@ -37,14 +47,111 @@ SHEET_URL = f'https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=cs
 TEMPLATE_PATH = 'Maturity_Slide_Template.pptx'
 OUTPUT_DIR = 'output'
 
+# Sheet columns that are not survey questions
+NON_QUESTION_COLUMNS = ('Timestamp', 'Email Address')
+
+# Local copy of the sheet export, revalidated with ETag / Last-Modified on each run
+SHEET_CACHE_PATH = os.path.join('.cache', 'sheet.csv')
+SHEET_CACHE_META_PATH = SHEET_CACHE_PATH + '.meta'
+
+# OpenAI concurrency / retry limits
+MAX_CONCURRENT_REQUESTS = 50
+MAX_RETRIES = 5
+
+# Number of presentations rendered in parallel (worker processes)
+PRESENTATION_WORKERS = os.cpu_count() or 4
+
+# Progress messages are buffered and written in batches; warnings and errors flush immediately
+LOG_BUFFER_CAPACITY = 10000
+logger = logging.getLogger('maturity_assessment')
+
+# Template bytes and pre-analysed layout, loaded once in the parent and shared with workers
+_TEMPLATE = {}
+
+# OpenAI Batch API settings (used with --batch)
+BATCH_INPUT_PATH = os.path.join(OUTPUT_DIR, 'batch_requests.jsonl')
+BATCH_POLL_INTERVAL = 60  # seconds
+
+# Recommendation cache: one JSON file per request, keyed by a hash of the model and prompt
+REC_CACHE_DIR = os.path.join('.cache', 'recs')
+REC_CACHE_TTL = None  # seconds; None keeps cached recommendations indefinitely
+
+# Static instructions sent as the system message on every recommendation request.
+# Per-client data goes in a compact JSON user message, so each call only repeats these
+# short instructions rather than a long templated prompt.
+SYSTEM_PROMPT = """You are an expert CRM marketing maturity consultant.
+
+The user message is JSON for one client and one assessment category: "category", "score" (1.0-4.0), "maturity_level", "focus_areas" (their up to three lowest-scoring questions, lowest first, each scored 1-4) and "strength" (their highest-scoring other question, or null).
+
+- Write a 2-3 sentence "summary" of the client's maturity in this category.
+- Write exactly four "recommendations", each one or two sentences.
+- Recommendations 1 and 2 must each address a specific focus area by name; for focus areas already scored 3-4, suggest how to refine or scale what works.
+- Recommendations 3 and 4 may cover another focus area or build on the strength.
+- Tailor every step to their maturity level; plain text, no markdown."""
+
+# Structured output schema the model must follow for recommendations
+RECOMMENDATION_SCHEMA = {
+    "name": "maturity_recommendations",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "recommendations": {"type": "array", "items": {"type": "string"}}
+        },
+        "required": ["summary", "recommendations"],
+        "additionalProperties": False
+    }
+}
+
+# Template slide titles and the categories they present
+SLIDE_CATEGORY_MAPPING = {
+    'Tech and Data': 'Tech & Data',
+    'Campaigning & Assets': 'Campaigning & Assets',
+    'Segmentation & Personalisation': 'Segmentation & Personalisation',
+    'Reporting & Insights': 'Reporting & Insights',
+    'People & Operations': 'People & Operations'
+}
+
+# Fallback recommendations shown when generation fails
+ERROR_RECOMMENDATIONS = [
+    "SPEAK TO SHAZ",
+    "Recommendation 1: Review current processes",
+    "Recommendation 2: Identify improvement areas",
+    "Recommendation 3: Implement best practices",
+    "Recommendation 4: Monitor progress"
+]
+
+# Shared HTTP session for Google Sheets requests
+_SESSION = requests.Session()
+
+
+def create_async_client(max_connections=MAX_CONCURRENT_REQUESTS):
+    """Create the async OpenAI client with a keep-alive pool sized to the concurrency limit"""
+    # Pooled connections (and TLS sessions) are reused across requests.
+    # The SDK retries rate limits, connection errors and 5xx responses with exponential backoff
+    # (honouring Retry-After), so no extra retry layer is added on top.
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=MAX_RETRIES,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    )
+
+
 # Initialize OpenAI client
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
     api_key = os.environ.get('OPENAI_API_KEY')
     if not api_key or api_key == 'your-api-key-here':
         print("ERROR: OPENAI_API_KEY not set. Please set it as an environment variable.")
         sys.exit(1)
     client = OpenAI(api_key=api_key)
+    aclient = create_async_client()
 except ImportError:
     print("ERROR: OpenAI package not installed. Run: pip install openai")
     sys.exit(1)
@@ -53,40 +160,129 @@ except Exception as e:
     sys.exit(1)
 
 
+# Precompiled patterns for column name cleaning
+_RE_NONALNUM = re.compile(r'[^a-z0-9\s]')
+_RE_WS = re.compile(r'\s+')
+
+# Precompiled patterns for cleaning model output
+_RE_BOLD_ITALIC = re.compile(r'\*\*\*(.*?)\*\*\*')
+_RE_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_RE_ITALIC_STAR = re.compile(r'\*(.*?)\*')
+_RE_ITALIC_UNDERSCORE = re.compile(r'_(.*?)_')
+_RE_HEADER = re.compile(r'^#+\s*', flags=re.MULTILINE)
+_RE_LINK = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_RE_CODE_BLOCK = re.compile(r'```[^`]*```')
+_RE_INLINE_CODE = re.compile(r'`([^`]+)`')
+_RE_AI_PREFIX = re.compile(r'^(Here are|Here\'s|Based on|To improve|Recommendations?:)\s*', flags=re.IGNORECASE)
+_RE_MULTI_DOTS = re.compile(r'\.{2,}')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+_RE_TRAILING_DOTS = re.compile(r'[\.]{2,}$')
+
+
+@functools.lru_cache(maxsize=512)
 def clean_column_name(col_name):
     """Clean column name: lowercase, remove ALL special characters, replace spaces with underscores"""
     cleaned = col_name.lower()
     cleaned = cleaned.replace('-', ' ')
-    cleaned = re.sub(r'[^a-z0-9\s]', '', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = _RE_NONALNUM.sub('', cleaned)
+    cleaned = _RE_WS.sub(' ', cleaned)
     cleaned = cleaned.strip().replace(' ', '_')
     return cleaned
 
 
+def setup_logging():
+    """Send progress messages to stdout through a buffer flushed in batches and at exit"""
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    memory_handler = logging.handlers.MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=stream_handler
+    )
+    logger.addHandler(memory_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def flush_logs():
+    """Write out buffered log messages now (logging.shutdown also flushes them at exit)"""
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def write_file_atomic(path, data):
+    """Write bytes (or stream a binary file object) to path via a temporary file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temporary file behind (e.g. if the download drops mid-stream)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def load_data():
-    """Load survey data from Google Sheets"""
-    print("Loading data from Google Sheet...")
-    response = requests.get(SHEET_URL, verify=False, timeout=30)
-    response.raise_for_status()
-    df = pd.read_csv(io.StringIO(response.text))
-    print(f"✓ Data loaded: {df.shape[0]} rows, {df.shape[1]} columns")
+    """Load survey data from Google Sheets, reusing the cached CSV if it hasn't changed"""
+    logger.info("Loading data from Google Sheet...")
+
+    # Send the validators from the last download so an unchanged sheet returns 304
+    headers = {}
+    if os.path.exists(SHEET_CACHE_PATH) and os.path.exists(SHEET_CACHE_META_PATH):
+        try:
+            with open(SHEET_CACHE_META_PATH) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    with _SESSION.get(SHEET_URL, headers=headers, timeout=30, stream=True) as response:
+        if response.status_code == 304:
+            logger.info("  Sheet unchanged since last run, using cached copy")
+        else:
+            response.raise_for_status()
+            # Stream the (decompressed) body straight to disk instead of buffering it in memory
+            response.raw.decode_content = True
+            write_file_atomic(SHEET_CACHE_PATH, response.raw)
+            write_file_atomic(SHEET_CACHE_META_PATH, json.dumps({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }).encode())
+
+    df = pd.read_csv(SHEET_CACHE_PATH)
+
+    # Coerce every answer column to numbers once; non-numeric answers become NaN
+    question_cols = [col for col in df.columns if col not in NON_QUESTION_COLUMNS]
+    df[question_cols] = df[question_cols].apply(pd.to_numeric, errors='coerce')
+
+    logger.info(f"✓ Data loaded: {df.shape[0]} rows, {df.shape[1]} columns")
     return df
 
 
 def setup_mappings(df):
     """Set up column name mappings and question categories"""
-    # Create column name mappings
+    # Create column name mappings (both directions) and ordered question lists in one pass
     COLUMN_NAME_MAPPING = {}
-    CLEANED_TO_ORIGINAL = {}
+    CLEANED_TO_ORIGINAL_COL = {}
+    question_columns = []
+    cleaned_questions = []
 
     for col in df.columns:
         cleaned = clean_column_name(col)
         COLUMN_NAME_MAPPING[col] = cleaned
-        CLEANED_TO_ORIGINAL[cleaned] = col
-
-    # Get question columns in order
-    question_columns = [col for col in df.columns if col not in ['Timestamp', 'Email Address']]
-    cleaned_questions = [COLUMN_NAME_MAPPING[q] for q in question_columns]
+        CLEANED_TO_ORIGINAL_COL[cleaned] = col
+        if col not in NON_QUESTION_COLUMNS:
+            question_columns.append(col)
+            cleaned_questions.append(cleaned)
 
     # Define question categories
     QUESTION_CATEGORIES = {
@@ -103,40 +299,40 @@ def setup_mappings(df):
         for question in questions:
             QUESTION_TO_CATEGORY[question] = category
 
-    # Create cleaned to original column mapping
-    CLEANED_TO_ORIGINAL_COL = {cleaned: original for original, cleaned in COLUMN_NAME_MAPPING.items()}
+    # Original column names per category, for the vectorized scoring pass
+    CATEGORY_TO_ORIGINAL_COLS = {
+        category: [CLEANED_TO_ORIGINAL_COL[q] for q in questions]
+        for category, questions in QUESTION_CATEGORIES.items()
+    }
 
     return (COLUMN_NAME_MAPPING, CLEANED_TO_ORIGINAL_COL, QUESTION_CATEGORIES, 
-            QUESTION_TO_CATEGORY, question_columns)
-
+            QUESTION_TO_CATEGORY, question_columns, CATEGORY_TO_ORIGINAL_COLS)
 
-def calculate_category_scores(client_row, question_categories, cleaned_to_original):
-    """Calculate average score for each category for a single client"""
-    scores = {}
 
-    for category, questions in question_categories.items():
-        category_scores = []
+def calculate_category_scores(df, question_columns, category_to_original_cols, column_name_mapping):
+    """Calculate category scores for every client in one pass, plus numeric responses keyed by cleaned name"""
+    # Answers are already numeric (see load_data); anything outside 1-4 becomes NaN
+    numeric = df[question_columns]
+    numeric = numeric.where((numeric >= 1) & (numeric <= 4))
 
-        for cleaned_q in questions:
-            original_col = cleaned_to_original.get(cleaned_q)
+    # Reduce over a contiguous float32 array (scores are 1-4, so FP32 is plenty)
+    values = numeric.to_numpy(dtype=np.float32)
+    valid = ~np.isnan(values)
+    col_pos = {col: i for i, col in enumerate(question_columns)}
 
-            if original_col:
-                value = client_row.get(original_col, None)
+    scores_df = pd.DataFrame(index=df.index)
+    for category, category_cols in category_to_original_cols.items():
+        positions = [col_pos[col] for col in category_cols]
+        totals = np.nansum(values[:, positions], axis=1)
+        counts = valid[:, positions].sum(axis=1)
+        # Categories with no valid answers stay NaN
+        scores_df[category] = np.divide(totals, counts, out=np.full_like(totals, np.nan), where=counts > 0)
 
-                if value is not None and pd.notna(value):
-                    try:
-                        num_value = float(value)
-                        if 1 <= num_value <= 4:
-                            category_scores.append(num_value)
-                    except (ValueError, TypeError):
-                        pass
+    scores_df['Email Address'] = df['Email Address']
+    scores_df['Timestamp'] = df['Timestamp']
 
-        if category_scores:
-            scores[category] = np.mean(category_scores)
-        else:
-            scores[category] = None
-
-    return scores
+    responses_df = numeric.rename(columns=column_name_mapping)
+    return scores_df, responses_df
 
 
 def find_text_boxes(slide):
@@ -148,36 +344,39 @@ def find_text_boxes(slide):
         'line': None
     }
 
-    # Find text boxes
+    lines = []
+    circles = []
+
+    # Single pass: find text boxes, lines and circle candidates
     for shape in slide.shapes:
-        if hasattr(shape, "text"):
+        try:
             text = shape.text.strip()
+        except AttributeError:
+            pass
+        else:
             if "Your score" in text and elements['score'] is None:
                 elements['score'] = shape
             elif "Recommendation 1" in text and elements['recommendations'] is None:
                 elements['recommendations'] = shape
 
-    # Find line and circle
-    lines = []
-    circles = []
+        try:
+            shape_type = shape.shape_type
+        except AttributeError:
+            continue
 
-    for shape in slide.shapes:
-        if hasattr(shape, 'shape_type'):
-            if shape.shape_type == 9:  # LINE
-                lines.append(shape)
-            elif shape.shape_type == 1:  # AUTO_SHAPE
-                if hasattr(shape, 'width') and hasattr(shape, 'height'):
-                    width = shape.width
-                    height = shape.height
-                    if abs(width - height) / max(width, height) < 0.2:
-                        try:
-                            if hasattr(shape, 'fill') and shape.fill.type == 1:
-                                circles.append(shape)
-                        except:
-                            pass
+        if shape_type == 9:  # LINE
+            lines.append(shape)
+        elif shape_type == 1:  # AUTO_SHAPE
+            try:
+                width = shape.width
+                height = shape.height
+                if abs(width - height) / max(width, height) < 0.2 and shape.fill.type == 1:
+                    circles.append(shape)
+            except Exception:
+                pass
 
     if lines:
-        elements['line'] = max(lines, key=lambda l: l.width if hasattr(l, 'width') else 0)
+        elements['line'] = max(lines, key=lambda l: getattr(l, 'width', 0))
 
     if circles and elements['line']:
         line_y = elements['line'].top + (elements['line'].height / 2)
@@ -189,34 +388,73 @@ def find_text_boxes(slide):
     return elements
 
 
+def map_template_elements(prs, CATEGORY_TO_SLIDE):
+    """Find each category slide's elements once and record their positions in slide.shapes"""
+    TEMPLATE_ELEMENTS = {}
+    for category, slide_idx in CATEGORY_TO_SLIDE.items():
+        slide = prs.slides[slide_idx]
+        elements = find_text_boxes(slide)
+        # Match on the underlying XML element: shape IDs can repeat in copy-pasted slides
+        shape_positions = {shape._element: i for i, shape in enumerate(slide.shapes)}
+        TEMPLATE_ELEMENTS[category] = {
+            name: shape_positions[shape._element] if shape is not None else None
+            for name, shape in elements.items()
+        }
+    return TEMPLATE_ELEMENTS
+
+
+def measure_circle_geometry(prs, CATEGORY_TO_SLIDE, TEMPLATE_ELEMENTS):
+    """Record each category's score line and circle size once, in EMUs, for circle placement"""
+    CIRCLE_GEOMETRY = {}
+    for category, slide_idx in CATEGORY_TO_SLIDE.items():
+        elements = resolve_elements(prs.slides[slide_idx], TEMPLATE_ELEMENTS[category])
+        line, circle = elements['line'], elements['orange_circle']
+        if line is None or circle is None:
+            continue
+        CIRCLE_GEOMETRY[category] = {
+            'line_left': line.left,
+            'line_width': line.width,
+            'line_cy': line.top + line.height // 2,
+            'circle_w': circle.width,
+            'circle_h': circle.height
+        }
+    return CIRCLE_GEOMETRY
+
+
+def resolve_elements(slide, element_positions):
+    """Resolve recorded shape positions to the shapes on a freshly opened slide"""
+    shapes = list(slide.shapes)
+    return {name: shapes[i] if i is not None else None for name, i in element_positions.items()}
+
+
 def clean_text_for_presentation(text):
     """Clean markdown and formatting from text to make it presentable in PowerPoint"""
     if not text:
         return text
     
     # Remove markdown bold/italic
-    text = re.sub(r'\*\*\*(.*?)\*\*\*', r'\1', text)  # Remove ***bold***
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove **bold**
-    text = re.sub(r'\*(.*?)\*', r'\1', text)  # Remove *italic*
-    text = re.sub(r'_(.*?)_', r'\1', text)  # Remove _italic_
+    text = _RE_BOLD_ITALIC.sub(r'\1', text)  # Remove ***bold***
+    text = _RE_BOLD.sub(r'\1', text)  # Remove **bold**
+    text = _RE_ITALIC_STAR.sub(r'\1', text)  # Remove *italic*
+    text = _RE_ITALIC_UNDERSCORE.sub(r'\1', text)  # Remove _italic_
     
     # Remove markdown headers
-    text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)  # Remove # headers
+    text = _RE_HEADER.sub('', text)  # Remove # headers
     
     # Remove markdown links but keep text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)  # [text](url) -> text
+    text = _RE_LINK.sub(r'\1', text)  # [text](url) -> text
     
     # Remove markdown code blocks
-    text = re.sub(r'```[^`]*```', '', text)  # Remove ```code blocks```
-    text = re.sub(r'`([^`]+)`', r'\1', text)  # Remove `inline code`
+    text = _RE_CODE_BLOCK.sub('', text)  # Remove ```code blocks```
+    text = _RE_INLINE_CODE.sub(r'\1', text)  # Remove `inline code`
     
     # Remove common AI prefixes/suffixes
-    text = re.sub(r'^(Here are|Here\'s|Based on|To improve|Recommendations?:)\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\.{2,}', '.', text)  # Multiple dots to single
+    text = _RE_AI_PREFIX.sub('', text)
+    text = _RE_MULTI_DOTS.sub('.', text)  # Multiple dots to single
     
     # Remove extra whitespace and clean up
-    text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single
-    text = re.sub(r'\n\s*\n', '\n', text)  # Multiple newlines to single
+    text = _RE_WS.sub(' ', text)  # Multiple spaces to single
+    text = _RE_BLANK_LINES.sub('\n', text)  # Multiple newlines to single
     text = text.strip()
     
     # Ensure proper sentence capitalization (first letter uppercase)
@@ -224,7 +462,7 @@ def clean_text_for_presentation(text):
         text = text[0].upper() + text[1:]
     
     # Remove trailing punctuation issues
-    text = re.sub(r'[\.]{2,}$', '.', text)  # Multiple trailing dots to single
+    text = _RE_TRAILING_DOTS.sub('.', text)  # Multiple trailing dots to single
     
     return text
 
@@ -269,150 +507,127 @@ def fit_text_to_textbox(paragraphs_list, shape):
     return min_font_size
 
 
-def generate_recommendations(category, score, questions_in_category, client_responses, original_questions_dict):
-    """Generate recommendations using OpenAI"""
-    # Identify low-scoring questions
-    low_scoring_questions = []
-    all_questions_context = []
-
-    for cleaned_q in questions_in_category:
-        q_score = client_responses.get(cleaned_q, None)
-        if q_score is not None and isinstance(q_score, (int, float)):
-            original_q = original_questions_dict.get(cleaned_q, cleaned_q)
-            question_info = {
-                'cleaned': cleaned_q,
-                'original': original_q,
-                'score': q_score
-            }
-            all_questions_context.append(question_info)
+def determine_maturity_level(score):
+    """Determine maturity level from a category score"""
+    if score <= 1.5:
+        return "not mature"
+    elif score <= 2.5:
+        return "developing"
+    elif score <= 3.5:
+        return "mature"
+    else:
+        return "very mature"
 
-            if q_score <= 2:
-                low_scoring_questions.append(question_info)
 
-    low_scoring_questions.sort(key=lambda x: x['score'])
-    all_questions_context.sort(key=lambda x: x['score'])
+def recommendation_cache_key(request):
+    """Cache key for a recommendation request: SHA-256 of the model and the full prompt/body"""
+    payload = request["model"] + "\x00" + json.dumps(request, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-    questions_detail = "\n".join([
-        f"- Question: {q['original']}\n  Score: {q['score']}/4"
-        for q in all_questions_context
-    ])
 
-    focus_areas = ""
-    if low_scoring_questions:
-        focus_areas = "\n\nAreas requiring immediate attention (low scores):\n" + "\n".join([
-            f"- {q['original']} (Score: {q['score']}/4)"
-            for q in low_scoring_questions[:3]
-        ])
+def load_cached_recommendations(cache_key):
+    """Return cached (summary, recommendations) for a key, or None on a miss or expired entry"""
+    path = os.path.join(REC_CACHE_DIR, f"{cache_key}.json")
+    try:
+        if REC_CACHE_TTL is not None and time.time() - os.path.getmtime(path) > REC_CACHE_TTL:
+            return None
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
 
-    # Determine maturity level
-    if score <= 1.5:
-        maturity_level = "not mature"
-    elif score <= 2.5:
-        maturity_level = "developing"
-    elif score <= 3.5:
-        maturity_level = "mature"
-    else:
-        maturity_level = "very mature"
+    # Anything other than [summary, [recommendations...]] (e.g. an old format) is a miss
+    if not (isinstance(cached, list) and len(cached) == 2
+            and isinstance(cached[0], str) and isinstance(cached[1], list)):
+        return None
+    summary, recommendations = cached
+    return summary, recommendations
 
-    prompt = f"""You are a CRM marketing maturity consultant. Generate recommendations for a client.
 
-        Category: {category}
-        Overall Maturity Score: {score:.2f}/4.0 ({maturity_level})
+def save_cached_recommendations(cache_key, result):
+    """Write (summary, recommendations) to the cache atomically"""
+    path = os.path.join(REC_CACHE_DIR, f"{cache_key}.json")
+    write_file_atomic(path, json.dumps(result).encode())
 
-        Client's responses to all questions in this category:
-        {questions_detail}
-        {focus_areas}
 
-        Instructions:
-        1. Generate a brief 2-3 sentence summary of their current maturity level in this category
-        2. Generate four specific, actionable recommendations that:
-        - PRIORITIZE addressing the low-scoring areas identified above
-        - Reference the specific questions where they scored low (1-2 out of 4)
-        - Provide concrete, actionable steps based on the question context
-        - Are tailored to their current maturity level
+def build_recommendation_request(category, score, questions_in_category, client_responses, original_questions_dict):
+    """Build the chat completions request body for a category's recommendations"""
+    # Rank the client's answered questions, lowest score first
+    answered_questions = []
 
-        Focus especially on the questions where they scored 1-2, as these are the areas needing the most improvement.
+    for cleaned_q in questions_in_category:
+        q_score = client_responses.get(cleaned_q, None)
+        if q_score is not None and isinstance(q_score, (int, float)) and not math.isnan(q_score):
+            original_q = original_questions_dict.get(cleaned_q, cleaned_q)
+            answered_questions.append({
+                'original': original_q,
+                'score': float(q_score)
+            })
 
-        Format the response as:
-        SUMMARY: [your summary here]
-        RECOMMENDATIONS:
-        1. [recommendation 1 - should address a specific low-scoring question]
-        2. [recommendation 2 - should address a specific low-scoring question]
-        3. [recommendation 3 - can address another area or build on improvements]
-        4. [recommendation 4 - can address another area or build on improvements]
+    answered_questions.sort(key=lambda x: x['score'])
+    # The bottom three are the focus areas; the top answer outside them is the strength
+    focus_areas = answered_questions[:3]
+    top_question = answered_questions[-1] if len(answered_questions) > 3 else None
 
-        Make each recommendation specific, actionable, and directly related to the questions they answered poorly."""
+    # Determine maturity level
+    maturity_level = determine_maturity_level(score)
+
+    # Only the client-specific data goes in the user message; the instructions live in the
+    # short static system prompt, keeping input tokens per call low
+    client_data = {
+        "category": category,
+        "score": round(float(score), 2),
+        "maturity_level": maturity_level,
+        "focus_areas": [{"question": q['original'], "score": q['score']} for q in focus_areas],
+        "strength": ({"question": top_question['original'], "score": top_question['score']}
+                     if top_question else None)
+    }
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert CRM marketing consultant providing actionable recommendations."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(client_data)}
+        ],
+        "temperature": 0.7,
+        "max_tokens": 350,
+        "response_format": {"type": "json_schema", "json_schema": RECOMMENDATION_SCHEMA}
+    }
 
-        result = response.choices[0].message.content
 
-        if "SUMMARY:" in result:
-            parts = result.split("RECOMMENDATIONS:")
-            summary = parts[0].replace("SUMMARY:", "").strip()
-            summary = clean_text_for_presentation(summary) # Clean summary
-            recommendations_text = parts[1] if len(parts) > 1 else ""
+def parse_recommendations(result):
+    """Parse the model's JSON response into a summary and four recommendations"""
+    data = orjson.loads(result)
+    summary = clean_text_for_presentation(data["summary"])
+    recommendations = [clean_text_for_presentation(rec) for rec in data["recommendations"]][:4]
+    while len(recommendations) < 4:
+        recommendations.append("Continue building on the recommendations above.")
+    return summary[:200], recommendations
 
-            recommendations = []
-            for line in recommendations_text.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    rec = line.split('.', 1)[-1].strip() if '.' in line else line.lstrip('- • ').strip()
-                    rec = clean_text_for_presentation(rec)  # Clean markdown formatting
-                    if rec and len(rec) > 10:
-                        recommendations.append(rec)
 
-            while len(recommendations) < 4:
-                recommendations.append("Continue building on the recommendations above.")
+async def generate_recommendations(category, score, questions_in_category, client_responses, original_questions_dict):
+    """Generate recommendations using OpenAI"""
+    request = build_recommendation_request(
+        category, score, questions_in_category, client_responses, original_questions_dict
+    )
 
-            return summary[:200], recommendations[:4]
-        else:
-            lines = result.split('\n')
-            summary = lines[0][:200] if lines else "Summary generated"
-            recommendations = [line.strip() for line in lines[1:] if line.strip() and len(line.strip()) > 10][:4]
-            # Clean each recommendation
-            recommendations = [clean_text_for_presentation(rec) for rec in recommendations]
-            while len(recommendations) < 4:
-                recommendations.append("Continue improving in this area.")
-            return summary, recommendations
+    try:
+        response = await aclient.chat.completions.create(**request)
+        return parse_recommendations(response.choices[0].message.content)
 
     except Exception as e:
-        print(f"  ⚠️  Error generating recommendations: {e}")
-        return f"Error: {str(e)}", [
-            "SPEAK TO SHAZ",
-            "Recommendation 1: Review current processes",
-            "Recommendation 2: Identify improvement areas",
-            "Recommendation 3: Implement best practices",
-            "Recommendation 4: Monitor progress"
-        ]
+        logger.warning(f"  ⚠️  Error generating recommendations: {e}")
+        return f"Error: {str(e)}", ERROR_RECOMMENDATIONS
 
 
 def map_slides_to_categories(prs):
     """Map slide titles to category names"""
-    SLIDE_CATEGORY_MAPPING = {
-        'Tech and Data': 'Tech & Data',
-        'Campaigning & Assets': 'Campaigning & Assets',
-        'Segmentation & Personalisation': 'Segmentation & Personalisation',
-        'Reporting & Insights': 'Reporting & Insights',
-        'People & Operations': 'People & Operations'
-    }
-    
     CATEGORY_TO_SLIDE = {}
     for i, slide in enumerate(prs.slides):
         for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                title = shape.text.strip()
-                if title in SLIDE_CATEGORY_MAPPING:
-                    category = SLIDE_CATEGORY_MAPPING[title]
+            if shape.is_placeholder:
+                category = SLIDE_CATEGORY_MAPPING.get(shape.text.strip())
+                if category is not None:
                     CATEGORY_TO_SLIDE[category] = i
                     break
     
@@ -425,45 +640,135 @@ def email_to_filename(email):
     return f"{safe_email}_Maturity_Assessment.pptx"
 
 
-def generate_client_presentation(client_email, client_scores, client_responses, 
-                                  COLUMN_NAME_MAPPING, CLEANED_TO_ORIGINAL_COL,
-                                  QUESTION_CATEGORIES, output_filename):
+def build_recommendation_jobs(client_email, client_scores, response_row, RESPONSE_COL_POS,
+                              ORIGINAL_QUESTIONS_PER_CATEGORY, QUESTION_CATEGORIES):
+    """Build generate_recommendations arguments for each scored category of a client"""
+    jobs = {}
+    for category, score in client_scores.items():
+        if score is None or math.isnan(score):
+            continue
+
+        questions_in_category = QUESTION_CATEGORIES.get(category, [])
+        category_responses = {
+            q: response_row[RESPONSE_COL_POS[q]] if q in RESPONSE_COL_POS else 'N/A'
+            for q in questions_in_category
+        }
+
+        jobs[(client_email, category)] = (
+            category, score, questions_in_category, category_responses,
+            ORIGINAL_QUESTIONS_PER_CATEGORY.get(category, {})
+        )
+
+    return jobs
+
+
+async def _bounded(coro, sem):
+    """Await a coroutine while holding the semaphore"""
+    async with sem:
+        return await coro
+
+
+async def generate_all_recommendations(jobs, max_concurrent=MAX_CONCURRENT_REQUESTS):
+    """Generate recommendations for every (client, category) job concurrently"""
+    sem = asyncio.Semaphore(max_concurrent)
+    keys = list(jobs)
+    results = await asyncio.gather(
+        *[_bounded(generate_recommendations(*jobs[key]), sem) for key in keys]
+    )
+    return dict(zip(keys, results))
+
+
+def generate_recommendations_batch(jobs):
+    """Generate recommendations for every (client, category) job via the OpenAI Batch API"""
+    if not jobs:
+        return {}
+
+    # Write one chat completions request per job
+    custom_ids = {}
+    with open(BATCH_INPUT_PATH, 'w') as f:
+        for key, args in jobs.items():
+            client_email, category = key
+            custom_id = f"{client_email}|{category}"
+            custom_ids[custom_id] = key
+            f.write(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": build_recommendation_request(*args)
+            }) + "\n")
+
+    # Upload and submit the batch
+    with open(BATCH_INPUT_PATH, 'rb') as f:
+        batch_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info(f"  Submitted batch {batch.id} ({len(custom_ids)} requests)")
+
+    # Poll until the batch finishes
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+        logger.info(f"  Batch status: {batch.status}")
+        flush_logs()
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+    counts = batch.request_counts
+    if counts is not None:
+        logger.info(f"  Batch finished: {counts.completed} completed, {counts.failed} failed")
+
+    # Map results back to (client, category); a failed request only affects its own job
+    results = {}
+    output = client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        key = custom_ids.get(item["custom_id"])
+        if key is None:
+            continue
+        try:
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                raise RuntimeError(item.get("error") or response.get("body"))
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[key] = parse_recommendations(content)
+        except Exception as e:
+            logger.warning(f"  ⚠️  Error generating recommendations for {item['custom_id']}: {e}")
+            results[key] = (f"Error: {str(e)}", ERROR_RECOMMENDATIONS)
+
+    # Requests that errored before producing a response only appear in the error file
+    for custom_id, key in custom_ids.items():
+        if key not in results:
+            logger.warning(f"  ⚠️  No batch result for {custom_id}")
+            results[key] = ("Error: no batch result", ERROR_RECOMMENDATIONS)
+
+    return results
+
+
+def generate_client_presentation(client_email, client_scores, client_recommendations,
+                                  template_bytes, CATEGORY_TO_SLIDE, TEMPLATE_ELEMENTS,
+                                  CIRCLE_GEOMETRY, output_filename):
     """Generate PowerPoint presentation for a client"""
-    prs = Presentation(TEMPLATE_PATH)
-    CATEGORY_TO_SLIDE = map_slides_to_categories(prs)
-    
-    # Map responses
-    question_responses = {}
-    for orig_col, cleaned_col in COLUMN_NAME_MAPPING.items():
-        if orig_col in client_responses:
-            question_responses[cleaned_col] = client_responses[orig_col]
+    prs = Presentation(io.BytesIO(template_bytes))
 
     # Process each category
     for category, score in client_scores.items():
         if category not in CATEGORY_TO_SLIDE:
             continue
 
-        if pd.isna(score) or score is None:
+        if score is None or math.isnan(score):
             continue
 
         slide_idx = CATEGORY_TO_SLIDE[category]
         slide = prs.slides[slide_idx]
-        elements = find_text_boxes(slide)
+        elements = resolve_elements(slide, TEMPLATE_ELEMENTS[category])
 
-        questions_in_category = QUESTION_CATEGORIES.get(category, [])
-        category_responses = {q: question_responses.get(q, 'N/A') for q in questions_in_category}
-
-        original_questions_dict = {}
-        for cleaned_q in questions_in_category:
-            orig_col = CLEANED_TO_ORIGINAL_COL.get(cleaned_q)
-            if orig_col:
-                original_questions_dict[cleaned_q] = orig_col
-
-        # Generate recommendations
-        print(f"  Generating recommendations for {category} (score: {score:.2f})...")
-        summary, recommendations = generate_recommendations(
-            category, score, questions_in_category, category_responses, original_questions_dict
-        )
+        summary, recommendations = client_recommendations[category]
         
         # Update score
         if elements['score']:
@@ -512,38 +817,132 @@ def generate_client_presentation(client_email, client_scores, client_responses,
             else:
                 elements['recommendations'].text = recommendations_text
 
-        # Position orange circle
-        if elements['orange_circle'] and elements['line']:
+        # Position orange circle along the score line using the template's geometry
+        geometry = CIRCLE_GEOMETRY.get(category)
+        if elements['orange_circle'] and geometry:
             try:
-                line = elements['line']
-                line_left = line.left
-                line_width = line.width
-                line_top = line.top
-                line_height = line.height
-
-                score_position = score / 4.0
-                circle_x = line_left + (line_width * score_position)
-                circle_y = line_top + (line_height / 2)
-
+                circle_x = geometry['line_left'] + int(geometry['line_width'] * score / 4.0)
                 circle = elements['orange_circle']
-                circle_width = circle.width
-                circle_height = circle.height
-
-                circle.left = int(circle_x - (circle_width / 2))
-                circle.top = int(circle_y - (circle_height / 2))
+                circle.left = circle_x - geometry['circle_w'] // 2
+                circle.top = geometry['line_cy'] - geometry['circle_h'] // 2
             except Exception as e:
-                print(f"    ⚠️  Could not position orange circle: {e}")
+                logger.warning(f"    ⚠️  Could not position orange circle: {e}")
 
     prs.save(output_filename)
     return output_filename
 
 
+def load_template():
+    """Read and analyse the template once, stashing it for presentation workers"""
+    with open(TEMPLATE_PATH, 'rb') as f:
+        template_bytes = f.read()
+    template_prs = Presentation(io.BytesIO(template_bytes))
+    CATEGORY_TO_SLIDE = map_slides_to_categories(template_prs)
+
+    _TEMPLATE['bytes'] = template_bytes
+    _TEMPLATE['category_to_slide'] = CATEGORY_TO_SLIDE
+    _TEMPLATE['elements'] = map_template_elements(template_prs, CATEGORY_TO_SLIDE)
+    _TEMPLATE['geometry'] = measure_circle_geometry(
+        template_prs, CATEGORY_TO_SLIDE, _TEMPLATE['elements']
+    )
+
+
+def render_presentation(client_email, client_scores, client_recommendations, output_filename):
+    """Worker entry point: render one client's presentation from the loaded template"""
+    return generate_client_presentation(
+        client_email, client_scores, client_recommendations,
+        _TEMPLATE['bytes'], _TEMPLATE['category_to_slide'], _TEMPLATE['elements'],
+        _TEMPLATE['geometry'], output_filename
+    )
+
+
+def _init_presentation_worker(template):
+    """Install the parent's loaded template in a spawned worker process"""
+    _TEMPLATE.update(template)
+
+
+def presentation_executor(max_workers=PRESENTATION_WORKERS):
+    """Create the process pool used to render presentations
+
+    On Linux, forked workers inherit the loaded template copy-on-write, so nothing but
+    per-client arguments is pickled. Elsewhere workers are spawned and receive the
+    template bytes and layout once each through the pool initializer.
+    """
+    if sys.platform.startswith('linux'):
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context('fork'))
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               initializer=_init_presentation_worker,
+                               initargs=(dict(_TEMPLATE),))
+
+
+def generate_presentations(pending, recommendations, QUESTION_CATEGORIES,
+                           max_workers=PRESENTATION_WORKERS):
+    """Render a presentation for every pending client, returning the files written"""
+    generated_files = []
+    if not pending:
+        return generated_files
+
+    logger.info("\nGenerating presentations...")
+
+    # Read and analyse the template once; each client re-opens it from memory
+    load_template()
+
+    # Empty the log buffer so forked workers don't inherit (and re-emit) pending messages
+    flush_logs()
+
+    # Each worker opens its own Presentation from the shared, read-only template bytes
+    with presentation_executor(max_workers) as executor:
+        futures = {}
+        for client_email, client_scores, _, output_filename in pending:
+            client_recommendations = {
+                category: recommendations[(client_email, category)]
+                for category in QUESTION_CATEGORIES
+                if (client_email, category) in recommendations
+            }
+            future = executor.submit(
+                render_presentation,
+                client_email, client_scores, client_recommendations, output_filename
+            )
+            futures[future] = client_email
+
+        for future in as_completed(futures):
+            client_email = futures[future]
+            try:
+                output_filename = future.result()
+                generated_files.append(output_filename)
+                logger.info(f"  ✓ Saved: {os.path.basename(output_filename)}")
+            except Exception as e:
+                logger.error(f"  ❌ Error for {client_email}: {e}")
+
+    return generated_files
+
+
 def main():
     """Main execution function"""
-    print("="*60)
-    print("Marketing Maturity Assessment Automation")
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*60)
+    parser = argparse.ArgumentParser(description="Marketing Maturity Assessment Automation")
+    parser.add_argument('--batch', action='store_true',
+                        help="Generate recommendations via the OpenAI Batch API (cheaper, up to 24h)")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_REQUESTS,
+                        help=f"Maximum in-flight OpenAI requests in live mode (default: {MAX_CONCURRENT_REQUESTS})")
+    parser.add_argument('--workers', type=int, default=PRESENTATION_WORKERS,
+                        help=f"Number of presentations rendered in parallel (default: {PRESENTATION_WORKERS})")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.concurrency != MAX_CONCURRENT_REQUESTS:
+        # Resize the connection pool so every permitted request can be on the wire at once
+        global aclient
+        aclient = create_async_client(args.concurrency)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    setup_logging()
+
+    logger.info("="*60)
+    logger.info("Marketing Maturity Assessment Automation")
+    logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("="*60)
     
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -553,73 +952,109 @@ def main():
         df = load_data()
         
         # Setup mappings
-        print("\nSetting up mappings...")
+        logger.info("\nSetting up mappings...")
         (COLUMN_NAME_MAPPING, CLEANED_TO_ORIGINAL_COL, QUESTION_CATEGORIES,
-         QUESTION_TO_CATEGORY, question_columns) = setup_mappings(df)
-        print(f"✓ Mapped {len(QUESTION_CATEGORIES)} categories")
+         QUESTION_TO_CATEGORY, question_columns, CATEGORY_TO_ORIGINAL_COLS) = setup_mappings(df)
+        ORIGINAL_QUESTIONS_PER_CATEGORY = {
+            category: {q: CLEANED_TO_ORIGINAL_COL[q] for q in questions if q in CLEANED_TO_ORIGINAL_COL}
+            for category, questions in QUESTION_CATEGORIES.items()
+        }
+        logger.info(f"✓ Mapped {len(QUESTION_CATEGORIES)} categories")
         
         # Calculate scores for all clients
-        print("\nCalculating category scores...")
-        category_scores_list = []
-        
-        for idx, row in df.iterrows():
-            client_scores = calculate_category_scores(row, QUESTION_CATEGORIES, CLEANED_TO_ORIGINAL_COL)
-            client_scores['Email Address'] = row['Email Address']
-            client_scores['Timestamp'] = row['Timestamp']
-            category_scores_list.append(client_scores)
-        
-        scores_df = pd.DataFrame(category_scores_list)
-        print(f"✓ Calculated scores for {len(scores_df)} clients")
+        logger.info("\nCalculating category scores...")
+        scores_df, responses_df = calculate_category_scores(
+            df, question_columns, CATEGORY_TO_ORIGINAL_COLS, COLUMN_NAME_MAPPING
+        )
+        logger.info(f"✓ Calculated scores for {len(scores_df)} clients")
         
-        # Generate presentations
-        print(f"\nGenerating presentations...")
-        generated_files = []
+        # Collect clients that still need a presentation
+        logger.info("\nChecking for existing presentations...")
+        pending = []
         skipped_files = []
+        # List the output directory once; queued files are added so duplicate emails are skipped too
+        existing_files = set(os.listdir(OUTPUT_DIR))
 
-        for idx, row in scores_df.iterrows():
-            client_email = row['Email Address']
-            client_scores = {cat: row[cat] for cat in QUESTION_CATEGORIES.keys()}
-
-            client_row = df[df['Email Address'] == client_email].iloc[0]
-            client_responses = {}
-            for col in question_columns:
-                client_responses[col] = client_row[col]
+        # Scores and responses share df's row order; responses are read as NumPy row views
+        response_values = responses_df.to_numpy()
+        RESPONSE_COL_POS = {col: i for i, col in enumerate(responses_df.columns)}
+        client_emails = scores_df['Email Address'].tolist()
+        all_client_scores = scores_df[list(QUESTION_CATEGORIES)].to_dict('records')
+        for row_idx, (client_email, client_scores) in enumerate(zip(client_emails, all_client_scores)):
 
             filename = email_to_filename(client_email)
             output_filename = os.path.join(OUTPUT_DIR, filename)
             
-            # Check if presentation already exists
-            if os.path.exists(output_filename):
-                print(f"\n  Skipping: {client_email} (presentation already exists)")
+            # Check if presentation already exists (or is already queued for a duplicate email)
+            if filename in existing_files:
+                logger.info(f"\n  Skipping: {client_email} (presentation already exists)")
                 skipped_files.append(output_filename)
                 continue
-            
-            print(f"\n  Processing: {client_email}")
-            try:
-                generate_client_presentation(
-                    client_email, client_scores, client_responses,
-                    COLUMN_NAME_MAPPING, CLEANED_TO_ORIGINAL_COL,
-                    QUESTION_CATEGORIES, output_filename
-                )
-                generated_files.append(output_filename)
-                print(f"    ✓ Saved: {filename}")
-            except Exception as e:
-                print(f"    ❌ Error: {e}")
 
-        print(f"\n{'='*60}")
-        print(f"✓ Successfully generated {len(generated_files)} new presentations")
+            existing_files.add(filename)
+            pending.append((client_email, client_scores, response_values[row_idx], output_filename))
+
+        # Generate recommendations for all clients and categories up front
+        jobs = {}
+        for client_email, client_scores, response_row, _ in pending:
+            jobs.update(build_recommendation_jobs(
+                client_email, client_scores, response_row, RESPONSE_COL_POS,
+                ORIGINAL_QUESTIONS_PER_CATEGORY, QUESTION_CATEGORIES
+            ))
+
+        # Reuse cached recommendations for identical requests (same model and prompt)
+        cache_keys = {
+            key: recommendation_cache_key(build_recommendation_request(*job_args))
+            for key, job_args in jobs.items()
+        }
+        recommendations = {}
+        for key, cache_key in cache_keys.items():
+            cached = load_cached_recommendations(cache_key)
+            if cached is not None:
+                recommendations[key] = cached
+
+        # Clients with the same answer pattern in a category produce the same prompt;
+        # request each distinct prompt once and share the result across the group
+        uncached_groups = {}
+        for key, cache_key in cache_keys.items():
+            if key not in recommendations:
+                uncached_groups.setdefault(cache_key, []).append(key)
+        uncached_jobs = {keys[0]: jobs[keys[0]] for keys in uncached_groups.values()}
+        logger.info(f"\nGenerating recommendations for {len(jobs)} categories across {len(pending)} clients "
+                    f"({len(recommendations)} cached, {len(uncached_jobs)} unique requests)...")
+
+        if args.batch:
+            new_recommendations = generate_recommendations_batch(uncached_jobs)
+        else:
+            new_recommendations = asyncio.run(
+                generate_all_recommendations(uncached_jobs, args.concurrency)
+            )
+
+        for key, result in new_recommendations.items():
+            cache_key = cache_keys[key]
+            if result[1] is not ERROR_RECOMMENDATIONS:
+                save_cached_recommendations(cache_key, result)
+            for group_key in uncached_groups[cache_key]:
+                recommendations[group_key] = result
+        logger.info(f"✓ Generated {len(new_recommendations)} recommendation sets")
+
+        # Generate presentations
+        generated_files = generate_presentations(
+            pending, recommendations, QUESTION_CATEGORIES, args.workers
+        )
+
+        logger.info(f"\n{'='*60}")
+        logger.info(f"✓ Successfully generated {len(generated_files)} new presentations")
         if skipped_files:
-            print(f"⊘ Skipped {len(skipped_files)} existing presentations")
-        print(f"Saved to: {OUTPUT_DIR}/")
+            logger.info(f"⊘ Skipped {len(skipped_files)} existing presentations")
+        logger.info(f"Saved to: {OUTPUT_DIR}/")
         
-        print(f"\n{'='*60}")
-        print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*60)
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("="*60)
         
     except Exception as e:
-        print(f"\n❌ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"\n❌ Fatal error: {e}")
         sys.exit(1)
 
 